@@ -7,7 +7,7 @@
 import torch
 import torch.nn.functional as F
 
-from iree.turbine.aot import *
+from iree.turbine.aot import FxProgramsBuilder, export
 
 from sharktank.layers.mixture_of_experts_block import MoeBlock
 from sharktank.utils import cli
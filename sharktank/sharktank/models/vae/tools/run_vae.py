@@ -12,6 +12,7 @@ import torch
 from iree.turbine import aot
 
 from sharktank.layers import ThetaLayer
+from sharktank.types import mark_export_external_theta
 from sharktank.utils.patching import SaveModuleResultTensorsPatch
 from sharktank.utils import cli
 from sharktank.models.punet.tools.sample_data import load_inputs, save_outputs
@@ -24,20 +25,35 @@ from iree.turbine.dynamo.passes import (
 )
 import numpy as np
 
+# Attention ops decomposed during export when requested.
+_SDPA_DECOMPS = (
+    torch.ops.aten._scaled_dot_product_flash_attention_for_cpu,
+    torch.ops.aten._scaled_dot_product_flash_attention.default,
+    torch.ops.aten.scaled_dot_product_attention,
+)
 
-def export_vae(model: ThetaLayer, sample_inputs, decomp_attn: bool) -> aot.ExportOutput:
-    for t in model.theta.flatten().values():
-        aot.ExternalTensorTrait(external_name=t.name, external_scope="").set(
-            t.as_torch()
-        )
 
-    decomp_list = []
-    if decomp_attn:
-        decomp_list = [
-            torch.ops.aten._scaled_dot_product_flash_attention_for_cpu,
-            torch.ops.aten._scaled_dot_product_flash_attention.default,
-            torch.ops.aten.scaled_dot_product_attention,
-        ]
+def export_vae(
+    model: ThetaLayer,
+    sample_inputs,
+    decomp_attn: bool,
+    dynamic_batch: bool = False,
+    max_batch_size: int = 16,
+) -> aot.ExportOutput:
+    mark_export_external_theta(model.theta)
+
+    dynamic_shapes = None
+    if dynamic_batch:
+        # Export can not generalize a batch dimension traced at size 1, so a
+        # single sample is repeated to trace at size 2 instead.
+        if sample_inputs.shape[0] == 1:
+            sample_inputs = sample_inputs.repeat(2, *[1] * (sample_inputs.dim() - 1))
+        batch_dim = torch.export.Dim("batch", min=1, max=max_batch_size)
+        dynamic_shapes = {"sample_inputs": {0: batch_dim}}
+
+    # Without decompositions SDPA is exported as a single op, which IREE
+    # lowers to its tiled, fused attention rather than unfused matmuls.
+    decomp_list = list(_SDPA_DECOMPS) if decomp_attn else []
     with decompositions.extend_aot_decompositions(
         from_current=True, add_ops=decomp_list
     ):
@@ -47,6 +63,7 @@ def export_vae(model: ThetaLayer, sample_inputs, decomp_attn: bool) -> aot.Expor
         @fxb.export_program(
             name=f"decode",
             args=tuple(torch.unsqueeze(sample_inputs, 0)),
+            dynamic_shapes=dynamic_shapes,
             strict=False,
         )
         def _(
@@ -67,6 +84,17 @@ def main(argv):
     parser.add_argument("--dtype", default="float16", help="DType to run in")
     parser.add_argument("--export", type=Path, help="Export to path (vs run)")
     parser.add_argument("--bs", default=1, type=int, help="Batch size for export")
+    parser.add_argument(
+        "--dynamic_batch",
+        action="store_true",
+        help="Exports decode with a dynamic batch dimension of up to --max_bs",
+    )
+    parser.add_argument(
+        "--max_bs",
+        default=16,
+        type=int,
+        help="Largest batch size accepted by a --dynamic_batch export",
+    )
     parser.add_argument(
         "--inputs",
         type=Path,
@@ -103,15 +131,23 @@ def main(argv):
     parser.add_argument(
         "--decomp_attn",
         action="store_true",
-        help="Decomposes the attention op during export",
+        help="Decomposes the attention op during export. By default attention is "
+        "kept whole so that the compiler can lower it to a fused attention kernel",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Runs the eager model through torch.compile (ignored with --export)",
     )
     args = cli.parse(parser, args=argv)
+    if args.dynamic_batch and args.max_bs < max(args.bs, 2):
+        parser.error("--max_bs must be at least 2 and at least --bs")
 
     device = args.device
     dtype = getattr(torch, args.dtype)
 
+    # `get_input_dataset` already moves the dataset to `args.device`.
     ds = cli.get_input_dataset(args)
-    ds.to(device=device)
 
     mdl = VaeDecoderModel.from_dataset(ds)
     # Run a step for debugging.
@@ -124,7 +160,13 @@ def main(argv):
 
     if args.export:
         # TODO move export from a run_vae file
-        output = export_vae(mdl, inputs, args.decomp_attn)
+        output = export_vae(
+            mdl,
+            inputs,
+            args.decomp_attn,
+            dynamic_batch=args.dynamic_batch,
+            max_batch_size=args.max_bs,
+        )
         output.save_mlir(args.export)
         print("exported VAE model. Skipping eager execution")
     else:
@@ -134,7 +176,12 @@ def main(argv):
             intermediates_saver = SaveModuleResultTensorsPatch()
             intermediates_saver.patch_child_modules(mdl.cond_model)
 
-        results = mdl.forward(inputs)
+        forward = mdl.forward
+        if args.compile:
+            forward = torch.compile(mdl, mode="reduce-overhead", dynamic=False)
+
+        with torch.inference_mode():
+            results = forward(inputs)
         print("results:", results)
 
         if args.outputs:
@@ -22,11 +22,25 @@ def get_random_inputs(
     width: int = 1024,
     height: int = 1024,
     latent_channels: int = 16,
+    generator: torch.Generator | None = None,
 ):
+    """Returns random latents allocated directly on `device`.
+
+    If given, `generator` must live on `device`; otherwise the default
+    generator for that device is used.
+    """
     if config == "sdxl":
         logger.debug("sdxl returning inputs")
         assert width % 8 == 0 and height % 8 == 0
-        return torch.rand(bs, 4, width // 8, height // 8, dtype=dtype).to(device)
+        return torch.rand(
+            bs,
+            4,
+            width // 8,
+            height // 8,
+            dtype=dtype,
+            device=device,
+            generator=generator,
+        )
     elif config == "flux":
         logger.debug("flux returning inputs")
         return torch.rand(
@@ -34,7 +48,9 @@ def get_random_inputs(
             math.ceil(height / 16) * math.ceil(width / 16),
             4 * latent_channels,
             dtype=dtype,
-        ).to(device)
+            device=device,
+            generator=generator,
+        )
     else:
         logger.debug("config: ", config)
         raise AssertionError(f"{config} config not implmented [sdxl, flux] implemented")
@@ -9,7 +9,7 @@ from parameterized import parameterized, param
 from typing import Callable
 import pytest
 import torch
-from iree.turbine.aot import *
+from iree.turbine.aot import FxProgramsBuilder
 from sharktank.layers.testing import make_random_moe_block_theta
 from sharktank.utils.random import make_rand_torch
 from sharktank.utils.testing import assert_tensor_close
@@ -423,6 +423,8 @@ def main(argv, log_config=UVICORN_LOG_CONFIG):
         port=args.port,
         log_config=log_config,
         timeout_keep_alive=args.timeout_keep_alive,
+        # Stay on the stdlib loop even when uvloop is installed for the SD app.
+        loop="asyncio",
     )
 
 
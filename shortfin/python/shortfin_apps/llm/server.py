@@ -157,6 +157,8 @@ def run_server(argv, log_config=uvicorn.config.LOGGING_CONFIG, port: int | None
         port=port or args.port,
         log_config=log_config,
         timeout_keep_alive=args.timeout_keep_alive,
+        # Stay on the stdlib loop even when uvloop is installed for the SD app.
+        loop="asyncio",
     )
 
 
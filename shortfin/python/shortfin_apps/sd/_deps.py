@@ -4,6 +4,8 @@
 # See https://llvm.org/LICENSE.txt for license information.
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
+import sys
+
 from shortfin.support.deps import ShortfinDepNotFoundError
 
 try:
@@ -20,3 +22,14 @@ try:
     import dataclasses_json
 except ModuleNotFoundError as e:
     raise ShortfinDepNotFoundError(__name__, "dataclasses-json") from e
+
+try:
+    import orjson
+except ModuleNotFoundError as e:
+    raise ShortfinDepNotFoundError(__name__, "orjson") from e
+
+if sys.platform != "win32":
+    try:
+        import uvloop
+    except ModuleNotFoundError as e:
+        raise ShortfinDepNotFoundError(__name__, "uvloop") from e
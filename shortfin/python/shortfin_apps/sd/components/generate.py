@@ -6,19 +6,25 @@
 
 import asyncio
 import logging
+import os
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
 
 from typing import (
     TypeVar,
     Union,
 )
 
-from fastapi.responses import JSONResponse
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
 
 from shortfin_apps.types.Base64CharacterEncodedByteSequence import (
     Base64CharacterEncodedByteSequence,
 )
 
-from shortfin_apps.utilities.image import png_from
+from shortfin_apps.utilities.image import png_bytes_from, png_from
 from shortfin_apps.text_to_image.TextToImageInferenceOutput import (
     TextToImageInferenceOutput,
 )
@@ -35,6 +41,55 @@ from .metrics import measure
 
 logger = logging.getLogger("shortfin-sd.generate")
 
+# PNG encoding is CPU bound and releases the GIL while compressing, so it is
+# moved off of the worker loop and spread across images.
+_PNG_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="shortfin-sd-png"
+)
+
+
+def _submit_to_png_pool(fn, *args) -> asyncio.Future:
+    """Runs `fn(*args)` on the PNG pool, resolving a future on the current loop.
+
+    Neither `run_in_executor` nor `asyncio.wrap_future` work on the shortfin
+    worker event loop: it has no default executor and does not implement
+    `is_closed()`, which `wrap_future` checks before scheduling its result.
+    """
+    loop = asyncio.get_running_loop()
+    result = loop.create_future()
+
+    def set_state(pool_future):
+        if result.cancelled():
+            return
+        exception = pool_future.exception()
+        if exception is not None:
+            result.set_exception(exception)
+        else:
+            result.set_result(pool_future.result())
+
+    _PNG_POOL.submit(fn, *args).add_done_callback(
+        lambda pool_future: loop.call_soon_threadsafe(set_state, pool_future)
+    )
+    return result
+
+
+# Server-Timing header value, with per-stage durations in milliseconds.
+_SERVER_TIMING_TEMPLATE = (
+    'pre;desc="Batch Pre-processing";dur={pre:.3f},'
+    'infer;desc="Batch Inference";dur={infer:.3f},'
+    'post;desc="Batch Post-processing";dur={post:.3f}'
+)
+
+
+def _milliseconds_since(start_ns: int) -> float:
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+
+def _multipart_png_body_from(png_images: list[bytes], boundary: str) -> bytes:
+    delimiter = f"--{boundary}\r\nContent-Type: image/png\r\n\r\n".encode()
+    parts = [delimiter + each_png_image + b"\r\n" for each_png_image in png_images]
+    return b"".join(parts) + f"--{boundary}--\r\n".encode()
+
 
 class GenerateImageProcess(sf.Process):
     """Process instantiated for every image generation.
@@ -46,20 +101,27 @@ class GenerateImageProcess(sf.Process):
     Responsible for a single image.
     """
 
+    __slots__ = [
+        "client",
+        "exec_request",
+        "index",
+        "output",
+    ]
+
     def __init__(
         self,
         client: "ClientGenerateBatchProcess",
-        gen_req: GenerateReqInput,
+        exec_request: SDXLInferenceExecRequest,
         index: int,
     ):
         super().__init__(fiber=client.fiber)
         self.client = client
-        self.gen_req = gen_req
+        self.exec_request = exec_request
         self.index = index
         self.output: Union[TextToImageInferenceOutput, None] = None
 
     async def run(self):
-        exec = SDXLInferenceExecRequest.from_batch(self.gen_req, self.index)
+        exec = self.exec_request
         self.client.batcher.submit(exec)
         await exec.done
 
@@ -104,36 +166,80 @@ class ClientGenerateBatchProcess(sf.Process):
     async def run(self):
         logger.debug("Started ClientBatchGenerateProcess: %r", self)
         try:
-            # Launch all individual generate processes and wait for them to finish.
-            gen_processes: list[GenerateImageProcess] = []
-            for index in range(self.gen_req.num_output_images):
-                gen_process = GenerateImageProcess(self, self.gen_req, index)
-                gen_processes.append(gen_process)
-                gen_process.launch()
+            # Launch all individual generate processes and wait for them to
+            # finish. Processes are awaitable on their termination.
+            # Splitting the batch into per-image exec requests is timed as
+            # pre-processing, ahead of handing them to the batcher.
+            pre_start_ns = time.perf_counter_ns()
+            gen_processes: list[GenerateImageProcess] = [
+                GenerateImageProcess(
+                    self,
+                    SDXLInferenceExecRequest.from_batch(self.gen_req, index),
+                    index,
+                )
+                for index in range(self.gen_req.num_output_images)
+            ]
+            pre_ms = _milliseconds_since(pre_start_ns)
 
-            await asyncio.gather(*gen_processes)
+            infer_start_ns = time.perf_counter_ns()
+            await asyncio.gather(
+                *(each_process.launch() for each_process in gen_processes)
+            )
+            infer_ms = _milliseconds_since(infer_start_ns)
 
             # TODO: stream image outputs
             logging.debug("Responding to one shot batch")
 
-            png_images: list[Base64CharacterEncodedByteSequence] = []
-
             for index_of_each_process, each_process in enumerate(gen_processes):
                 if each_process.output is None:
                     raise Exception(
                         f"Expected output for process {index_of_each_process} but got `None`"
                     )
 
-                each_png_image = png_from(each_process.output.image)
-                png_images.append(each_png_image)
-
-            self.responder.send_response(
-                JSONResponse(
-                    content={
-                        "images": png_images,
-                    },
-                    media_type="application/json",
+            # Raw PNG bytes skip the base64 pass and its ~33% size overhead.
+            wants_raw_png = bool(self.gen_req.output_type) and all(
+                each_output_type == "png"
+                for each_output_type in self.gen_req.output_type
+            )
+            encode = png_bytes_from if wants_raw_png else png_from
+
+            post_start_ns = time.perf_counter_ns()
+            png_images: list[bytes | Base64CharacterEncodedByteSequence] = list(
+                await asyncio.gather(
+                    *(
+                        _submit_to_png_pool(encode, each_process.output.image)
+                        for each_process in gen_processes
+                    )
                 )
             )
+            post_ms = _milliseconds_since(post_start_ns)
+
+            headers = {
+                "Server-Timing": _SERVER_TIMING_TEMPLATE.format(
+                    pre=pre_ms,
+                    infer=infer_ms,
+                    post=post_ms,
+                ),
+            }
+
+            if wants_raw_png:
+                boundary = uuid.uuid4().hex
+                self.responder.send_response(
+                    Response(
+                        content=_multipart_png_body_from(png_images, boundary),
+                        media_type=f"multipart/mixed; boundary={boundary}",
+                        headers=headers,
+                    )
+                )
+            else:
+                self.responder.send_response(
+                    ORJSONResponse(
+                        content={
+                            "images": png_images,
+                        },
+                        media_type="application/json",
+                        headers=headers,
+                    )
+                )
         finally:
             self.responder.ensure_response()
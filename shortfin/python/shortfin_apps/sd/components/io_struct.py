@@ -28,7 +28,10 @@ class GenerateReqInput:
     input_ids: Optional[Union[List[List[int]], List[int]]] = None
     # Negative token ids: only used in place of negative prompt.
     neg_input_ids: Optional[Union[List[List[int]], List[int]]] = None
-    # Output image format. Defaults to base64. One string ("PIL", "base64")
+    # Output image format. Defaults to base64. One string ("PIL", "base64", "png")
+    # If "png" is requested it must be for every image, and the raw PNG bytes
+    # are returned as parts of a multipart/mixed response instead of base64
+    # strings in JSON.
     output_type: Optional[List[str]] = None
     # The request id.
     rid: Optional[Union[List[str], str]] = None
@@ -70,6 +73,12 @@ class GenerateReqInput:
                 raise ValueError("The rid should be a list.")
         if self.output_type is None:
             self.output_type = ["base64"] * self.num_output_images
+        if "png" in self.output_type and any(
+            output_type != "png" for output_type in self.output_type
+        ):
+            raise ValueError(
+                'The "png" output type can not be mixed with other output types.'
+            )
         # Temporary restrictions
         heights = [self.height] if not isinstance(self.height, list) else self.height
         widths = [self.width] if not isinstance(self.width, list) else self.width
@@ -93,6 +93,10 @@ class SDXLInferenceExecRequest(InferenceExecRequest):
         self.image_array = image_array
 
         self.response_image: Union[Image, None] = None
+        self.response_images: list[Image] = []
+
+        # Requests merged into this one by the batcher, in batch order.
+        self.coalesced_requests: list["SDXLInferenceExecRequest"] = []
 
         self.done = sf.VoidFuture()
 
@@ -193,6 +197,41 @@ class SDXLInferenceExecRequest(InferenceExecRequest):
                 required = any([inp is None for inp in p_results])
                 return required, None
 
+    @property
+    def is_coalescible(self) -> bool:
+        """Whether this request can be merged with others into a single batch.
+
+        Only single prompt requests that still need their inputs prepared
+        qualify, since explicitly provided token ids and latents are filled
+        into the command buffer as a whole.
+        """
+        return (
+            self.batch_size == 1
+            and self.input_ids is None
+            and self.sample is None
+            and not isinstance(self.seed, list)
+            and not self.coalesced_requests
+        )
+
+    def coalesces_with(self, other: "SDXLInferenceExecRequest") -> bool:
+        # Guidance scale is a single scalar on device, so it must be shared.
+        return (
+            self.is_coalescible
+            and other.is_coalescible
+            and self.guidance_scale == other.guidance_scale
+        )
+
+    def complete(self):
+        """Marks the request as done, handing outputs back to coalesced requests."""
+        for index, each_request in enumerate(self.coalesced_requests):
+            each_request.response_image = (
+                self.response_images[index]
+                if index < len(self.response_images)
+                else None
+            )
+            each_request.done.set_success()
+        self.done.set_success()
+
     def reset(self, phase: InferencePhase):
         """Resets all per request state in preparation for an subsequent execution."""
         self.phase = None
@@ -230,3 +269,27 @@ class SDXLInferenceExecRequest(InferenceExecRequest):
             rec_inputs[item] = rec_input
         req = SDXLInferenceExecRequest(**rec_inputs)
         return req
+
+    @staticmethod
+    def coalesced_from(
+        requests: list["SDXLInferenceExecRequest"],
+    ) -> "SDXLInferenceExecRequest":
+        """Merges single image requests into one request with a batch dimension.
+
+        Requests are expected to share their phase metadata and to coalesce
+        with one another. The outputs are scattered back by `complete`.
+        """
+        if len(requests) == 1:
+            return requests[0]
+        first = requests[0]
+        req = SDXLInferenceExecRequest(
+            prompt=[each_request.prompt for each_request in requests],
+            neg_prompt=[each_request.neg_prompt for each_request in requests],
+            height=first.height,
+            width=first.width,
+            steps=first.steps,
+            guidance_scale=first.guidance_scale,
+            seed=[each_request.seed for each_request in requests],
+        )
+        req.coalesced_requests = list(requests)
+        return req
@@ -222,6 +222,21 @@ class SDXLBatcherProcess(BatcherProcess):
         self.strobes: int = 0
         self.ideal_batch_size: int = max(service.model_params.batch_sizes["clip"])
         self.num_fibers = len(service.meta_fibers)
+        # Batch sizes a coalesced request can run at end to end. Decode may
+        # run at the batch size itself or fall back to bs1 per image.
+        batch_sizes = service.model_params.batch_sizes
+        vae_batch_sizes = set(batch_sizes.get("vae", []))
+        self.coalescible_batch_sizes: list[int] = sorted(
+            bs
+            for bs in set.intersection(
+                *[
+                    set(sizes)
+                    for submodel, sizes in batch_sizes.items()
+                    if submodel != "vae"
+                ]
+            )
+            if bs in vae_batch_sizes or 1 in vae_batch_sizes
+        )
 
     def handle_inference_request(self, request):
         self.pending_requests.add(request)
@@ -247,14 +262,33 @@ class SDXLBatcherProcess(BatcherProcess):
             logger.debug(
                 f"Sending batch to fiber {meta_fiber.idx} (worker {meta_fiber.worker_idx})"
             )
-            await self.board(batch["reqs"][0], meta_fiber=meta_fiber)
+            await self.board(self.boardable_from(batch["reqs"]), meta_fiber=meta_fiber)
             if self.service.prog_isolation != sf.ProgramIsolation.PER_FIBER:
                 self.service.idle_meta_fibers.append(meta_fiber)
 
-    async def board(self, request, meta_fiber):
+    def boardable_from(self, requests: list[SDXLInferenceExecRequest]):
+        """Selects the requests from a batch that can run as one invocation.
+
+        Requests left out stay pending and board with a later flight.
+        """
+        first = requests[0]
+        coalescible = [first] + [
+            each_request
+            for each_request in requests[1:]
+            if first.coalesces_with(each_request)
+        ]
+        fitting_batch_sizes = [
+            bs for bs in self.coalescible_batch_sizes if bs <= len(coalescible)
+        ]
+        if not fitting_batch_sizes:
+            return [first]
+        return coalescible[: max(fitting_batch_sizes)]
+
+    async def board(self, requests: list[SDXLInferenceExecRequest], meta_fiber):
         exec_process = InferenceExecutorProcess(self.service, meta_fiber)
-        exec_process.exec_request = request
-        self.pending_requests.remove(request)
+        exec_process.exec_request = SDXLInferenceExecRequest.coalesced_from(requests)
+        for each_request in requests:
+            self.pending_requests.remove(each_request)
         exec_process.launch()
 
 
@@ -308,12 +342,12 @@ class InferenceExecutorProcess(sf.Process):
                 await self._decode(device=device)
             if phases[InferencePhase.POSTPROCESS]["required"]:
                 await self._postprocess(device=device)
-            self.exec_request.done.set_success()
+            self.exec_request.complete()
 
         except Exception:
             logger.exception("Fatal error in image generation")
             # TODO: Cancel and set error correctly
-            self.exec_request.done.set_success()
+            self.exec_request.complete()
 
         self.meta_fiber.command_buffers.append(self.exec_request.command_buffer)
         self.exec_request.command_buffer = None
@@ -357,13 +391,19 @@ class InferenceExecutorProcess(sf.Process):
         seed = self.exec_request.seed
 
         # Create and populate sample device array.
-        generator = sfnp.RandomGenerator(seed)
-
         sample_host = cb.sample.for_transfer()
         with sample_host.map(discard=True) as m:
             m.fill(bytes(1))
 
-        sfnp.fill_randn(sample_host, generator=generator)
+        if isinstance(seed, list):
+            # Coalesced requests keep the latents their own seed would give.
+            for i, each_seed in enumerate(seed):
+                sfnp.fill_randn(
+                    sample_host.view(i), generator=sfnp.RandomGenerator(each_seed)
+                )
+        else:
+            generator = sfnp.RandomGenerator(seed)
+            sfnp.fill_randn(sample_host, generator=generator)
 
         cb.sample.copy_from(sample_host)
         return
@@ -464,12 +504,11 @@ class InferenceExecutorProcess(sf.Process):
         cb = self.exec_request.command_buffer
         # Decode latents to images
         entrypoints = self.service.inference_functions[self.worker_index]["decode"]
-        if req_bs not in list(entrypoints.keys()):
+        if req_bs not in entrypoints:
             prog_bs = 1
-        for bs, fns in entrypoints.items():
-            if bs == prog_bs:
-                break
+        if prog_bs not in entrypoints:
             raise RuntimeError(f"Decode program batch size {prog_bs} not found.")
+        fns = entrypoints[prog_bs]
         if req_bs != prog_bs:
             for i in range(req_bs):
                 # Decode the denoised latents.
@@ -512,10 +551,12 @@ class InferenceExecutorProcess(sf.Process):
     async def _postprocess(self, device):
         # Process output images
         # TODO: reimpl with sfnp
-        permuted = np.transpose(self.exec_request.image_array, (0, 2, 3, 1))[0]
-        cast_image = (permuted * 255).round().astype("uint8")
-        processed_image = Image.fromarray(cast_image)
-        self.exec_request.response_image = processed_image
+        permuted = np.transpose(self.exec_request.image_array, (0, 2, 3, 1))
+        cast_images = (permuted * 255).round().astype("uint8")
+        self.exec_request.response_images = [
+            Image.fromarray(cast_image) for cast_image in cast_images
+        ]
+        self.exec_request.response_image = self.exec_request.response_images[0]
         return
 
 
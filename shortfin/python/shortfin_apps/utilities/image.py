@@ -23,10 +23,14 @@ def save_to_file(
     return derived_file_path
 
 
-def png_from(given_image: Image.Image) -> Base64CharacterEncodedByteSequence:
+def png_bytes_from(given_image: Image.Image) -> bytes:
     memory_for_png = BytesIO()
     given_image.save(memory_for_png, format="PNG")
-    png_from_memory = memory_for_png.getvalue()
+    return memory_for_png.getvalue()
+
+
+def png_from(given_image: Image.Image) -> Base64CharacterEncodedByteSequence:
+    png_from_memory = png_bytes_from(given_image)
     return Base64CharacterEncodedByteSequence.decoded_from(png_from_memory)
 
 
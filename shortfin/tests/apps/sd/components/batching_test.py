@@ -0,0 +1,162 @@
+# Copyright 2025 Advanced Micro Devices, Inc.
+#
+# Licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import asyncio
+import pytest
+
+from types import SimpleNamespace
+
+import shortfin as sf
+
+
+@pytest.fixture
+def lsys():
+    sc = sf.host.CPUSystemBuilder()
+    lsys = sc.create_system()
+    yield lsys
+    lsys.shutdown()
+
+
+@pytest.fixture
+def fiber(lsys):
+    return lsys.create_fiber()
+
+
+def make_request(index: int, **kwargs):
+    from shortfin_apps.sd.components.messages import SDXLInferenceExecRequest
+
+    params = dict(
+        prompt=f"prompt {index}",
+        neg_prompt=f"negative prompt {index}",
+        height=1024,
+        width=1024,
+        steps=2,
+        guidance_scale=7.5,
+        seed=index,
+    )
+    params.update(kwargs)
+    return SDXLInferenceExecRequest(**params)
+
+
+def make_batcher(fiber, batch_sizes: dict[str, list[int]]):
+    from shortfin_apps.sd.components.service import SDXLBatcherProcess
+
+    service = SimpleNamespace(
+        meta_fibers=[SimpleNamespace(fiber=fiber)],
+        idle_meta_fibers=[],
+        model_params=SimpleNamespace(batch_sizes=batch_sizes),
+        prog_isolation=sf.ProgramIsolation.PER_FIBER,
+    )
+    return SDXLBatcherProcess(service)
+
+
+def test_coalesces_with_matching_guidance_only(lsys):
+    async def main():
+        first = make_request(0)
+        assert first.coalesces_with(make_request(1))
+        assert not first.coalesces_with(make_request(2, guidance_scale=3.0))
+        assert not first.coalesces_with(make_request(3, prompt=["a", "b"]))
+        return True
+
+    assert lsys.run(main())
+
+
+def test_coalesced_from_keeps_per_request_inputs_in_order(lsys):
+    from shortfin_apps.sd.components.messages import SDXLInferenceExecRequest
+
+    async def main():
+        requests = [make_request(index) for index in range(3)]
+        coalesced = SDXLInferenceExecRequest.coalesced_from(requests)
+
+        assert coalesced.batch_size == 3
+        assert coalesced.prompt == ["prompt 0", "prompt 1", "prompt 2"]
+        assert coalesced.neg_prompt == [
+            "negative prompt 0",
+            "negative prompt 1",
+            "negative prompt 2",
+        ]
+        assert coalesced.seed == [0, 1, 2]
+        assert coalesced.guidance_scale == 7.5
+        assert coalesced.coalesced_requests == requests
+        assert not coalesced.is_coalescible
+
+        single = make_request(4)
+        assert SDXLInferenceExecRequest.coalesced_from([single]) is single
+        return True
+
+    assert lsys.run(main())
+
+
+def test_complete_scatters_outputs_in_order(lsys):
+    from shortfin_apps.sd.components.messages import SDXLInferenceExecRequest
+
+    async def main():
+        requests = [make_request(index) for index in range(3)]
+        coalesced = SDXLInferenceExecRequest.coalesced_from(requests)
+        coalesced.response_images = ["image 0", "image 1"]
+        coalesced.complete()
+
+        for each_request in [coalesced, *requests]:
+            await asyncio.wait_for(each_request.done, timeout=10)
+        return [each_request.response_image for each_request in requests]
+
+    assert lsys.run(main()) == ["image 0", "image 1", None]
+
+
+def test_coalescible_batch_sizes_require_decodable_sizes(lsys, fiber):
+    async def main():
+        batcher = make_batcher(
+            fiber,
+            {"clip": [1, 2, 4], "unet": [1, 2, 4], "vae": [2]},
+        )
+        return batcher.coalescible_batch_sizes
+
+    assert lsys.run(main()) == [2]
+
+
+def test_boardable_from_truncates_to_supported_batch_size(lsys, fiber):
+    async def main():
+        batcher = make_batcher(
+            fiber,
+            {"clip": [1, 2, 4], "unet": [1, 2, 4], "vae": [1]},
+        )
+        requests = [make_request(index) for index in range(3)]
+        requests.insert(1, make_request(9, guidance_scale=3.0))
+        return requests, batcher.boardable_from(requests)
+
+    requests, boardable = lsys.run(main())
+    assert boardable == [requests[0], requests[2]]
+
+
+def test_board_leaves_leftover_requests_pending(lsys, fiber, monkeypatch):
+    from shortfin_apps.sd.components import service
+
+    launched = []
+
+    class StubExecutorProcess:
+        def __init__(self, service, meta_fiber):
+            self.exec_request = None
+
+        def launch(self):
+            launched.append(self.exec_request)
+
+    monkeypatch.setattr(service, "InferenceExecutorProcess", StubExecutorProcess)
+
+    async def main():
+        batcher = make_batcher(fiber, {"clip": [1, 2], "unet": [1, 2], "vae": [1]})
+        requests = [make_request(index) for index in range(3)]
+        for each_request in requests:
+            batcher.handle_inference_request(each_request)
+
+        boardable = batcher.boardable_from(requests)
+        await batcher.board(boardable, meta_fiber=None)
+        return requests, boardable, batcher.pending_requests
+
+    requests, boardable, pending_requests = lsys.run(main())
+    assert len(boardable) == 2
+    assert len(launched) == 1
+    assert launched[0].coalesced_requests == boardable
+    assert pending_requests == set(requests) - set(boardable)
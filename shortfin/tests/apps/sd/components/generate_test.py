@@ -0,0 +1,177 @@
+# Copyright 2025 Advanced Micro Devices, Inc.
+#
+# Licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import asyncio
+import pytest
+import re
+
+from types import SimpleNamespace
+
+import shortfin as sf
+
+
+@pytest.fixture
+def lsys():
+    sc = sf.host.CPUSystemBuilder()
+    lsys = sc.create_system()
+    yield lsys
+    lsys.shutdown()
+
+
+@pytest.fixture
+def image():
+    from PIL import Image
+
+    return Image.new("RGB", (8, 8), color=(12, 34, 56))
+
+
+def image_for(prompt: str):
+    from PIL import Image
+
+    return Image.new("RGB", (8, 8), color=(len(prompt), 0, 0))
+
+
+class StubBatcher:
+    """Completes every submitted request immediately with a solid image."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, request):
+        self.submitted.append(request)
+        request.response_image = image_for(request.prompt)
+        request.done.set_success()
+
+
+class StubResponder:
+    def __init__(self):
+        self.responses = []
+
+    def send_response(self, response):
+        self.responses.append(response)
+
+    def ensure_response(self):
+        pass
+
+
+def make_gen_req(**kwargs):
+    from shortfin_apps.sd.components.io_struct import GenerateReqInput
+
+    params = dict(
+        prompt=["a prompt", "another prompt"],
+        neg_prompt=["a negative prompt"],
+        height=1024,
+        width=1024,
+        steps=2,
+        guidance_scale=7.5,
+        seed=1,
+    )
+    params.update(kwargs)
+    gen_req = GenerateReqInput(**params)
+    gen_req.post_init()
+    return gen_req
+
+
+def run_client_batch(lsys, gen_req):
+    """Runs a client batch process against a stub batcher, returning the response."""
+    from shortfin_apps.sd.components.generate import ClientGenerateBatchProcess
+
+    batcher = StubBatcher()
+    responder = StubResponder()
+    service = SimpleNamespace(
+        meta_fibers=[SimpleNamespace(fiber=lsys.create_fiber())],
+        batcher=batcher,
+    )
+
+    async def main():
+        await ClientGenerateBatchProcess(service, gen_req, responder).launch()
+
+    lsys.run(main())
+    assert len(batcher.submitted) == gen_req.num_output_images
+    assert len(responder.responses) == 1
+    return responder.responses[0]
+
+
+def test_png_pool_encode_resolves_on_worker(lsys, image):
+    from shortfin_apps.sd.components.generate import _submit_to_png_pool
+    from shortfin_apps.utilities.image import png_from
+
+    async def main():
+        return await asyncio.wait_for(_submit_to_png_pool(png_from, image), timeout=10)
+
+    assert lsys.run(main()) == png_from(image)
+
+
+def test_png_pool_encode_propagates_errors_on_worker(lsys):
+    from shortfin_apps.sd.components.generate import _submit_to_png_pool
+
+    def fail():
+        raise ValueError("encode failed")
+
+    async def main():
+        with pytest.raises(ValueError, match="encode failed"):
+            await asyncio.wait_for(_submit_to_png_pool(fail), timeout=10)
+        return True
+
+    assert lsys.run(main())
+
+
+def test_server_timing_reports_each_stage(lsys):
+    response = run_client_batch(lsys, make_gen_req())
+
+    server_timing = response.headers["server-timing"]
+    stages = re.findall(r'(\w+);desc="[^"]*";dur=(\d+\.\d{3})', server_timing)
+    assert [stage for stage, _ in stages] == ["pre", "infer", "post"]
+    assert all(float(duration) >= 0 for _, duration in stages)
+
+
+def test_multipart_png_body_framing():
+    from shortfin_apps.sd.components.generate import _multipart_png_body_from
+
+    body = _multipart_png_body_from([b"\x89PNG first", b"\x89PNG second"], "edge")
+    assert body == (
+        b"--edge\r\nContent-Type: image/png\r\n\r\n\x89PNG first\r\n"
+        b"--edge\r\nContent-Type: image/png\r\n\r\n\x89PNG second\r\n"
+        b"--edge--\r\n"
+    )
+
+
+def test_png_output_type_sends_raw_multipart(lsys):
+    from shortfin_apps.utilities.image import png_bytes_from
+
+    gen_req = make_gen_req(output_type=["png"])
+    response = run_client_batch(lsys, gen_req)
+
+    media_type, boundary = response.media_type.split("; boundary=")
+    assert media_type == "multipart/mixed"
+
+    delimiter = f"--{boundary}\r\nContent-Type: image/png\r\n\r\n".encode()
+    closing = f"--{boundary}--\r\n".encode()
+    assert response.body.endswith(closing)
+    parts = response.body[: -len(closing)].split(delimiter)
+    assert parts[0] == b""
+    assert parts[1:] == [
+        png_bytes_from(image_for(prompt)) + b"\r\n" for prompt in gen_req.prompt
+    ]
+
+
+def test_base64_output_type_sends_json(lsys):
+    import json
+
+    from shortfin_apps.utilities.image import png_from
+
+    gen_req = make_gen_req()
+    response = run_client_batch(lsys, gen_req)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "images": [png_from(image_for(prompt)) for prompt in gen_req.prompt]
+    }
+
+
+def test_mixed_png_output_type_is_rejected():
+    with pytest.raises(ValueError, match="png"):
+        make_gen_req(output_type=["png", "base64"])
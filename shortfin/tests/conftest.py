@@ -130,7 +130,7 @@ def generic_device(generic_fiber):
     return generic_fiber.device(0)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def cpu_lsys():
     sc = sf.host.CPUSystemBuilder()
     lsys = sc.create_system()